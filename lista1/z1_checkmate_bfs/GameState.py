@@ -30,3 +30,28 @@ class GameState:
 
     def __hash__(self):
         return hash((self.turn, tuple(self.w_king), tuple(self.w_rook), tuple(self.b_king)))
+
+
+# kodowanie stanu jako jednej liczby: bit tury (0 - white, 1 - black) i trzy 6-bitowe pola (x * 8 + y)
+def cords_to_square(cords: tuple[int, int]) -> int:
+    x, y = cords
+    return x * 8 + y
+
+
+def square_to_cords(square: int) -> tuple[int, int]:
+    return square >> 3, square & 7
+
+
+def state_to_int(state: GameState) -> int:
+    return ((state.turn == "black") << 18 |
+            cords_to_square(state.w_king) << 12 |
+            cords_to_square(state.w_rook) << 6 |
+            cords_to_square(state.b_king))
+
+
+def int_to_state(code: int) -> GameState:
+    return GameState(
+        "black" if code >> 18 else "white",
+        square_to_cords((code >> 12) & 63),
+        square_to_cords((code >> 6) & 63),
+        square_to_cords(code & 63))
@@ -0,0 +1,183 @@
+from functools import cache
+
+from GameState import GameState, state_to_int, cords_to_square, square_to_cords
+from z1 import get_king_moves, get_rook_moves
+
+# stany jako 19-bitowe liczby (patrz state_to_int), pola króla i wieży jako 64-bitowe maski
+BLACK = 1 << 18
+STATES_COUNT = 1 << 19
+UNSEEN = 255
+
+
+def squares_to_mask(squares) -> int:
+    mask = 0
+    for f in squares:
+        mask |= 1 << cords_to_square(f)
+    return mask
+
+
+KING_MASK = [squares_to_mask(get_king_moves(square_to_cords(sq))) for sq in range(64)]
+ROOK_MASK = [squares_to_mask(get_rook_moves(square_to_cords(sq))) for sq in range(64)]
+
+
+def mask_squares(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# to samo co is_checkmate, tylko na maskach
+def is_checkmate_packed(code: int) -> bool:
+    if not code & BLACK:
+        return False
+
+    w_king = (code >> 12) & 63
+    w_rook = (code >> 6) & 63
+    b_king = code & 63
+
+    b_king_fields = KING_MASK[b_king]
+    w_king_fields = KING_MASK[w_king]
+    rook_fields = ROOK_MASK[w_rook]
+
+    if b_king_fields >> w_king & 1 and not rook_fields >> w_king & 1:
+        return False
+    if b_king_fields >> w_rook & 1 and not w_king_fields >> w_rook & 1:
+        return False
+
+    return b_king_fields & ~(w_king_fields | rook_fields) == 0
+
+
+# to samo co find_next_moves, tylko na maskach
+def next_states_packed(code: int) -> list[int]:
+    w_king = (code >> 12) & 63
+    w_rook = (code >> 6) & 63
+    b_king = code & 63
+
+    if code & BLACK:
+        base = w_king << 12 | w_rook << 6
+        free = KING_MASK[b_king] & ~(KING_MASK[w_king] | ROOK_MASK[w_rook])
+        return [base | b for b in mask_squares(free)]
+
+    allowed = ~KING_MASK[b_king]
+    base = BLACK | b_king
+    return ([base | k << 12 | w_rook << 6 for k in mask_squares(KING_MASK[w_king] & allowed)] +
+            [base | w_king << 12 | r << 6 for r in mask_squares(ROOK_MASK[w_rook] & allowed)])
+
+
+# poprzedniki stanu w grafie z find_next_moves - ruchy króla i wieży są symetryczne,
+# więc cofnięcie ruchu to zwykły ruch z tymi samymi warunkami co w find_next_moves
+def previous_states_packed(code: int) -> list[int]:
+    w_king = (code >> 12) & 63
+    w_rook = (code >> 6) & 63
+    b_king = code & 63
+
+    result = []
+    if code & BLACK:
+        # ostatni ruch wykonał biały
+        base = b_king
+        if not KING_MASK[b_king] >> w_king & 1:
+            result.extend(k << 12 | w_rook << 6 | base for k in mask_squares(KING_MASK[w_king]))
+        if not KING_MASK[b_king] >> w_rook & 1:
+            result.extend(w_king << 12 | r << 6 | base for r in mask_squares(ROOK_MASK[w_rook]))
+    else:
+        # ostatni ruch wykonał czarny
+        if not (KING_MASK[w_king] | ROOK_MASK[w_rook]) >> b_king & 1:
+            base = BLACK | w_king << 12 | w_rook << 6
+            result.extend(base | b for b in mask_squares(KING_MASK[b_king]))
+    return result
+
+
+@cache
+def find_checkmates() -> tuple[int, ...]:
+    return tuple(code for code in range(BLACK, STATES_COUNT) if is_checkmate_packed(code))
+
+
+# bfs na liczbach z tablicą odwiedzonych stanów zamiast słownika obiektów
+def find_ending_packed(start_state: GameState) -> int:
+    return search_packed(state_to_int(start_state))
+
+
+def search_packed(start: int) -> int:
+    visited = bytearray(STATES_COUNT)
+    visited[start] = 1
+    frontier = [start]
+    moves = 0
+
+    while frontier:
+        next_frontier = []
+        for curr in frontier:
+            if is_checkmate_packed(curr):
+                return moves
+            for x in next_states_packed(curr):
+                if not visited[x]:
+                    visited[x] = 1
+                    next_frontier.append(x)
+        frontier = next_frontier
+        moves += 1
+
+    return -1
+
+
+# wersja dla puli procesów - zwraca też stan, żeby wyniki dało się dopasować bez zachowania kolejności
+def solve_code(code: int) -> tuple[int, int]:
+    return code, search_packed(code)
+
+
+# bfs z obu stron: do przodu od stanu startowego i wstecz od wszystkich matów, zawsze rozwijamy
+# cały poziom mniejszej granicy; pierwszy poziom, na którym granice się spotkają, daje minimum
+def search_bidirectional(start: int) -> tuple[int, dict]:
+    forward = bytearray([UNSEEN]) * STATES_COUNT
+    backward = bytearray([UNSEEN]) * STATES_COUNT
+    forward[start] = 0
+    forward_frontier = [start]
+    backward_frontier = list(find_checkmates())
+    for code in backward_frontier:
+        backward[code] = 0
+
+    stats = {
+        "forward_nodes": 1,
+        "backward_nodes": len(backward_frontier),
+        "max_forward_frontier": 1,
+        "max_backward_frontier": len(backward_frontier),
+        "forward_depth": 0,
+        "backward_depth": 0,
+    }
+
+    if backward[start] == 0:
+        return 0, stats
+
+    while forward_frontier and backward_frontier:
+        best = UNSEEN
+        next_frontier = []
+        if len(forward_frontier) <= len(backward_frontier):
+            depth = stats["forward_depth"] + 1
+            for curr in forward_frontier:
+                for x in next_states_packed(curr):
+                    if forward[x] == UNSEEN:
+                        forward[x] = depth
+                        next_frontier.append(x)
+                        if backward[x] != UNSEEN:
+                            best = min(best, depth + backward[x])
+            forward_frontier = next_frontier
+            stats["forward_depth"] = depth
+            stats["forward_nodes"] += len(next_frontier)
+            stats["max_forward_frontier"] = max(stats["max_forward_frontier"], len(next_frontier))
+        else:
+            depth = stats["backward_depth"] + 1
+            for curr in backward_frontier:
+                for x in previous_states_packed(curr):
+                    if backward[x] == UNSEEN:
+                        backward[x] = depth
+                        next_frontier.append(x)
+                        if forward[x] != UNSEEN:
+                            best = min(best, depth + forward[x])
+            backward_frontier = next_frontier
+            stats["backward_depth"] = depth
+            stats["backward_nodes"] += len(next_frontier)
+            stats["max_backward_frontier"] = max(stats["max_backward_frontier"], len(next_frontier))
+
+        if best != UNSEEN:
+            return best, stats
+
+    return -1, stats
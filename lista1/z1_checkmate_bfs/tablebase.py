@@ -0,0 +1,53 @@
+import mmap
+import os
+from collections import deque
+
+from GameState import GameState, state_to_int
+from bitboard import STATES_COUNT, find_checkmates, previous_states_packed
+
+# tablica odległości do mata dla wszystkich 2 * 64^3 stanów (indeksowana przez state_to_int)
+# obok modułu, a nie w katalogu bieżącym
+TABLEBASE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "krk_tablebase.bin")
+UNREACHABLE = 255
+
+
+# analiza wsteczna: bfs od wszystkich matów naraz, po odwróconych krawędziach
+def build_tablebase() -> bytearray:
+    table = bytearray([UNREACHABLE]) * STATES_COUNT
+    queue = deque()
+    for code in find_checkmates():
+        table[code] = 0
+        queue.append(code)
+
+    while queue:
+        curr = queue.popleft()
+        dist = table[curr] + 1
+        for prev in previous_states_packed(curr):
+            if table[prev] == UNREACHABLE:
+                table[prev] = dist
+                queue.append(prev)
+
+    return table
+
+
+def save_tablebase(table: bytearray, path: str = TABLEBASE_FILE):
+    with open(path, "wb") as f:
+        f.write(table)
+
+
+def load_tablebase(path: str = TABLEBASE_FILE) -> mmap.mmap:
+    # ucięty albo obcy plik dałby błędne odczyty (albo IndexError) dopiero w lookup
+    if os.path.getsize(path) != STATES_COUNT:
+        raise ValueError(f"{path} has {os.path.getsize(path)} bytes, expected {STATES_COUNT}")
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# odpowiednik find_ending: liczba ruchów do mata albo -1
+def lookup(state: GameState, table) -> int:
+    dist = table[state_to_int(state)]
+    return -1 if dist == UNREACHABLE else dist
+
+
+if __name__ == "__main__":
+    save_tablebase(build_tablebase())
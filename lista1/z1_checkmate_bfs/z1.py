@@ -1,8 +1,11 @@
+import os
+from collections import deque
 from copy import copy
-from queue import Queue
+from itertools import islice
+from multiprocessing import Pool
 
-from GameState import GameState
-from typing import List
+from GameState import GameState, state_to_int
+from typing import List, Iterable, Iterator
 
 
 def get_rook_moves(pos: tuple[int, int]) -> set:
@@ -91,18 +94,29 @@ def get_move_history(l_state: GameState, checked_moves: dict):
     return history
 
 
-def find_ending(start_state: GameState, debug=False, history=True) -> int:
+# stats - opcjonalny słownik, do którego wyszukiwanie dwukierunkowe dopisuje liczby węzłów,
+# największe granice i głębokości obu stron (patrz bitboard.search_bidirectional)
+def find_ending(start_state: GameState, debug=False, history=True, bidirectional=False, stats=None) -> int:
+    if bidirectional:
+        from bitboard import search_bidirectional
+        min_moves, search_stats = search_bidirectional(state_to_int(start_state))
+        if stats is not None:
+            stats.update(search_stats)
+        if debug:
+            print(f'Search stats: {search_stats}')
+        return min_moves
+
     checked_moves = {}
     move_history = {}
 
     initial_state = copy(start_state)
-    queue = Queue()
-    queue.put((initial_state, 0, None))
+    queue = deque()
+    queue.append((initial_state, 0, None))
     min_moves = float('inf')
     ending_move = None
 
     while queue:
-        el = queue.get()
+        el = queue.popleft()
         curr = el[0]
         curr_count = el[1]
         prev_state = el[2]
@@ -127,8 +141,7 @@ def find_ending(start_state: GameState, debug=False, history=True) -> int:
 
             filtered_moves = [(x, curr_count + 1, curr) for x in next_moves if x not in checked_moves]
 
-            for x in filtered_moves:
-                queue.put(x)
+            queue.extend(filtered_moves)
 
     if not ending_move:
         return -1
@@ -143,3 +156,39 @@ def find_ending(start_state: GameState, debug=False, history=True) -> int:
 
     return min_moves
 
+
+# wiele pozycji naraz: z tablicą odległości (tablebase.py) każde zapytanie to odczyt jednego bajtu,
+# bez tablicy - osobne bfs-y w puli procesów, ze wspólnym memo już rozwiązanych stanów
+def find_endings(states: Iterable[GameState], build_table=True, workers=None,
+                 chunk_size=1024) -> Iterator[tuple[GameState, int]]:
+    from tablebase import TABLEBASE_FILE, build_tablebase, save_tablebase, load_tablebase, lookup
+
+    if build_table and not os.path.exists(TABLEBASE_FILE):
+        # jedno wsteczne przeszukiwanie od wszystkich matów zamiast n przeszukiwań do przodu
+        save_tablebase(build_tablebase())
+
+    if os.path.exists(TABLEBASE_FILE):
+        table = load_tablebase()
+        for state in states:
+            yield state, lookup(state, table)
+        return
+
+    from bitboard import solve_code
+
+    memo = {}
+    states = iter(states)
+    with Pool(workers) as pool:
+        while chunk := list(islice(states, chunk_size)):
+            waiting = {}
+            for state in chunk:
+                code = state_to_int(state)
+                if code in memo:
+                    yield state, memo[code]
+                else:
+                    waiting.setdefault(code, []).append(state)
+
+            # wyniki oddajemy w kolejności rozwiązywania, nie wejścia
+            for code, moves in pool.imap_unordered(solve_code, waiting):
+                memo[code] = moves
+                for state in waiting[code]:
+                    yield state, moves
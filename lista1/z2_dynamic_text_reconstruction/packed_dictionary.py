@@ -0,0 +1,77 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+# skompilowany słownik: posortowane słowa (utf-8) sklejone w jeden blok + tablica przesunięć;
+# plik jest mapowany do pamięci, więc start nic nie wczytuje, a kilka procesów dzieli jedną kopię
+# format: "PDIC", liczba słów, najdłuższe słowo (w znakach), przesunięcia (count + 1), słowa
+MAGIC = b"PDIC"
+HEADER = struct.Struct("4sII")
+
+
+def compile_dictionary(words_path, output_path):
+    with open(words_path) as f:
+        words = sorted({x.strip().encode() for x in f} - {b""})
+
+    offsets = array("I", [0])
+    for w in words:
+        offsets.append(offsets[-1] + len(w))
+    max_len = max((len(w.decode()) for w in words), default=0)
+
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(words), max_len))
+        f.write(offsets.tobytes())
+        f.write(b"".join(words))
+
+
+class _Words:
+    # widok słów jako sekwencji - pozwala użyć bisect bez kopiowania
+    def __init__(self, data, offsets, start):
+        self.data = data
+        self.offsets = offsets
+        self.start = start
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, k):
+        return self.data[self.start + self.offsets[k]:self.start + self.offsets[k + 1]]
+
+
+class PackedDictionary:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, self.max_len = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled dictionary")
+        offsets_end = HEADER.size + 4 * (count + 1)
+        offsets = memoryview(self.data)[HEADER.size:offsets_end].cast("I")
+        self.words = _Words(self.data, offsets, offsets_end)
+
+    def __contains__(self, word: str) -> bool:
+        key = word.encode()
+        k = bisect_left(self.words, key)
+        return k < len(self.words) and self.words[k] == key
+
+    # ten sam interfejs co Trie.word_ends - zawężamy przedział słów o wspólnym prefiksie
+    # (bajt 0xff nie występuje w utf-8, więc prefix + 0xff jest za wszystkimi jego przedłużeniami)
+    def word_ends(self, text: str, start: int):
+        lo, hi = 0, len(self.words)
+        prefix = b""
+        for i in range(start, min(len(text), start + self.max_len)):
+            prefix += text[i].encode()
+            lo = bisect_left(self.words, prefix, lo, hi)
+            hi = bisect_left(self.words, prefix + b"\xff", lo, hi)
+            if lo == hi:
+                return
+            if self.words[lo] == prefix:
+                yield i + 1
+
+
+if __name__ == "__main__":
+    words_path = sys.argv[1] if len(sys.argv) > 1 else "zad2_words.txt"
+    output_path = sys.argv[2] if len(sys.argv) > 2 else "zad2_words.dict"
+    compile_dictionary(words_path, output_path)
@@ -0,0 +1,38 @@
+import sys
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from util import normalized_lines
+from z2 import text_reconstruction
+
+
+def reconstruct_line(line):
+    return text_reconstruction(line.rstrip("\n"))
+
+
+def reconstruct_chunk(lines):
+    return [reconstruct_line(line) for line in lines]
+
+
+# strumieniowe przetwarzanie korpusu: czytamy po kawałku, kawałki rozdzielamy między procesy,
+# a wyniki zapisujemy w kolejności wejścia; okno przesuwne - po zapisaniu najstarszego kawałka
+# od razu wysyłamy następny, więc procesy nie czekają na najwolniejszą linię całej porcji,
+# a w pamięci jest naraz co najwyżej chunk_size * chunks_in_flight linii
+def reconstruct_corpus(input_path, output_path, workers=None, chunk_size=64, chunks_in_flight=16):
+    with open(input_path) as fin, open(output_path, "w") as fout, Pool(workers) as pool:
+        lines = normalized_lines(fin)
+        in_flight = deque()
+        while True:
+            while len(in_flight) < chunks_in_flight and (chunk := list(islice(lines, chunk_size))):
+                in_flight.append(pool.apply_async(reconstruct_chunk, (chunk,)))
+            if not in_flight:
+                break
+            for result in in_flight.popleft().get():
+                fout.write(result + "\n")
+
+
+if __name__ == "__main__":
+    input_path = sys.argv[1] if len(sys.argv) > 1 else "pantadeusz.txt"
+    output_path = sys.argv[2] if len(sys.argv) > 2 else "zad2_output.txt"
+    reconstruct_corpus(input_path, output_path)
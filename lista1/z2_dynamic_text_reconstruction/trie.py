@@ -0,0 +1,37 @@
+# drzewo prefiksowe nad słownikiem - zamiast sprawdzać każdy fragment text[j:i],
+# idziemy od pozycji j w przód tylko dopóki istnieje słowo o takim prefiksie
+class Trie:
+    END = ""
+
+    def __init__(self, words=()):
+        self.root = {}
+        self.max_len = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        if not word:
+            return
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[self.END] = True
+        self.max_len = max(self.max_len, len(word))
+
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return False
+        return self.END in node
+
+    # końce (wyłącznie) wszystkich słów zaczynających się w text[start]
+    def word_ends(self, text: str, start: int):
+        node = self.root
+        for i in range(start, min(len(text), start + self.max_len)):
+            node = node.get(text[i])
+            if node is None:
+                return
+            if self.END in node:
+                yield i + 1
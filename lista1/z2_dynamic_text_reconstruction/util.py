@@ -1,5 +1,3 @@
-fin = open("ptwolnelektury.txt", "r")
-fout = open("test.txt", "w")
 import re
 
 def normalize_line(text):
@@ -12,6 +10,13 @@ def normalize_line_nospaces(text):
     text = re.sub(r"^[ \t]+", "", text, flags=re.MULTILINE)
     return "".join(text.split()) + '\n'
 
-for l in fin.readlines():
-    if l != "\n":
-        fout.write(normalize_line_nospaces(l))
+# leniwe czytanie - w pamięci jest tylko bieżąca linia
+def normalized_lines(file):
+    for l in file:
+        if l != "\n":
+            yield normalize_line_nospaces(l)
+
+
+if __name__ == "__main__":
+    with open("ptwolnelektury.txt", "r") as fin, open("test.txt", "w") as fout:
+        fout.writelines(normalized_lines(fin))
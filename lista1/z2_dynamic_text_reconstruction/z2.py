@@ -1,27 +1,41 @@
+import os
 from random import random
 
-fd = open("zad2_words.txt")
-ft = open("pantadeusz.txt")
+from packed_dictionary import PackedDictionary
+from trie import Trie
 
-dictionary = set([x.strip() for x in fd.readlines()])
+WORDS_FILE = "zad2_words.txt"
+DICTIONARY_FILE = "zad2_words.dict"  # budowany przez packed_dictionary.py
+
+# skompilowany słownik (jeśli jest aktualny) jest tylko mapowany do pamięci, bez wczytywania listy słów
+if os.path.exists(DICTIONARY_FILE) and (not os.path.exists(WORDS_FILE) or
+                                        os.path.getmtime(DICTIONARY_FILE) >= os.path.getmtime(WORDS_FILE)):
+    dictionary = PackedDictionary(DICTIONARY_FILE)
+    word_index = dictionary
+else:
+    fd = open(WORDS_FILE)
+    dictionary = set([x.strip() for x in fd.readlines()])
+    word_index = Trie(dictionary)
 
 
 def is_word(t):
     return t in dictionary
 
 
-def text_reconstruction(text):
+def text_reconstruction(text, index=None):
+    if index is None:
+        index = word_index
     dp = [0] * (len(text) + 1)
     dp[0] = 0
     prev = [0] * (len(text) + 1)
 
-    # wyliczanie maksymalnych wartości prefiksów (dp[]) razem z zapisywaniem tablicy do rekonstrukcji
-    for i in range(1, len(text) + 1):
-        for j in range(i):
-            if is_word(text[j:i]):
-                if dp[i] < dp[j] + len(text[j:i]) ** 2:
-                    dp[i] = dp[j] + len(text[j:i]) ** 2
-                    prev[i] = j
+    # wyliczanie maksymalnych wartości prefiksów (dp[]) razem z zapisywaniem tablicy do rekonstrukcji;
+    # idziemy w przód od każdego j, więc dp[j] jest już policzone, a sprawdzamy tylko prawdziwe końce słów
+    for j in range(len(text)):
+        for i in index.word_ends(text, j):
+            if dp[i] < dp[j] + (i - j) ** 2:
+                dp[i] = dp[j] + (i - j) ** 2
+                prev[i] = j
 
     # rekonstrukcja tekstu
     i = len(prev) - 1
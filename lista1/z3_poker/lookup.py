@@ -0,0 +1,50 @@
+import os
+import pickle
+from functools import cache
+from itertools import combinations_with_replacement
+from math import prod
+
+from z3 import Card, eval_hand, suits
+
+# tablica w stylu Cactus Keva: każda ranga to liczba pierwsza, iloczyn pięciu rang jednoznacznie
+# opisuje multizbiór rang, a ostatni bit mówi, czy wszystkie karty są w jednym kolorze
+RANK_PRIMES = {r: p for r, p in zip(range(2, 15), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41])}
+# obok modułu, a nie w katalogu bieżącym - niezależnie od tego, skąd jest uruchamiany
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hand_table.pkl")
+
+
+def hand_key(hand) -> int:
+    flush = all(c.suit == hand[0].suit for c in hand)
+    return prod(RANK_PRIMES[c.rank] for c in hand) << 1 | flush
+
+
+def build_table() -> dict:
+    table = {}
+    for ranks in combinations_with_replacement(RANK_PRIMES, 5):
+        # bez koloru: kolory na zmianę, więc pierwsza i ostatnia karta to za mało na kolor
+        mixed = [Card(r, suits[i % 4]) for i, r in enumerate(ranks)]
+        same = [Card(r, suits[0]) for r in ranks]
+        for hand in (mixed, same):
+            table[hand_key(hand)] = eval_hand(hand)
+    return table
+
+
+def load_table(path=TABLE_FILE) -> dict:
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    table = build_table()
+    with open(path, "wb") as f:
+        pickle.dump(table, f)
+    return table
+
+
+# wczytywana przy pierwszym użyciu, a nie przy imporcie
+@cache
+def get_table() -> dict:
+    return load_table()
+
+
+# zamiennik eval_hand: ten sam kod kategorii 1-9, ale jeden odczyt ze słownika
+def eval_hand_lookup(hand) -> int:
+    return get_table()[hand_key(hand)]
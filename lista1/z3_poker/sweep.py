@@ -0,0 +1,67 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+
+import numpy as np
+
+from vectorized import count_wins
+from z3 import fig_deck, blot_deck, poker_only_deck, one_color_deck, two_quads_deck, three_quads_deck
+
+
+def run_batch(b_deck, n, seed):
+    return count_wins(b_deck, fig_deck, n, np.random.default_rng(seed))
+
+
+# przedział Wilsona dla proporcji wins / n
+def wilson_interval(wins, n, z=1.96):
+    p = wins / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half = z * sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return center - half, center + half
+
+
+# porównanie wielu talii blotkarza: w każdej rundzie każda jeszcze niepewna talia dostaje
+# batches_per_round paczek po batch_size rozdań w puli procesów; każda paczka ma własny strumień
+# losowy z SeedSequence, więc wynik zależy tylko od seed, a nie od kolejności pracy procesów;
+# talia odpada, gdy połowa przedziału ufności spadnie poniżej tolerance albo skończą się próby
+def sweep(decks: dict, seed=0, batch_size=1_000_000, batches_per_round=8, tolerance=0.0005,
+          max_trials=50_000_000, z=1.96, workers=None):
+    # Card ("card" w namedtuple) nie daje się zserializować, do procesów wysyłamy zwykłe krotki
+    decks = {name: [tuple(c) for c in deck] for name, deck in decks.items()}
+    seeds = dict(zip(decks, np.random.SeedSequence(seed).spawn(len(decks))))
+    wins = {name: 0 for name in decks}
+    trials = {name: 0 for name in decks}
+    results = {}
+
+    with ProcessPoolExecutor(workers) as pool:
+        while len(results) < len(decks):
+            active = [name for name in decks if name not in results]
+            futures = {name: [pool.submit(run_batch, decks[name], batch_size, s)
+                              for s in seeds[name].spawn(batches_per_round)]
+                       for name in active}
+
+            for name in active:
+                wins[name] += sum(f.result() for f in futures[name])
+                trials[name] += batch_size * batches_per_round
+                low, high = wilson_interval(wins[name], trials[name], z)
+                if (high - low) / 2 <= tolerance or trials[name] >= max_trials:
+                    results[name] = {
+                        "p": wins[name] / trials[name],
+                        "low": low,
+                        "high": high,
+                        "trials": trials[name],
+                    }
+
+    return results
+
+
+if __name__ == "__main__":
+    decks = {
+        "all cards": blot_deck,
+        "5 cards": poker_only_deck,
+        "9 cards": one_color_deck,
+        "8 cards": two_quads_deck,
+        "12 cards": three_quads_deck,
+    }
+    for name, r in sweep(decks).items():
+        print(f"{name}: {r['p']:.5f} [{r['low']:.5f}, {r['high']:.5f}] after {r['trials']} games")
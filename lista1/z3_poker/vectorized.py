@@ -0,0 +1,80 @@
+from functools import cache
+from itertools import combinations
+
+import numpy as np
+
+# wersja wektorowa eval_hand: karty to małe liczby (rangi i kolory w osobnych tablicach),
+# a n rąk naraz to tablica (n, 5); kategorie i kolejność sprawdzania takie same jak w eval_hand
+
+
+def encode_deck(deck):
+    ranks = np.array([c[0] for c in deck], dtype=np.int8)
+    suits = np.array([c[1] for c in deck], dtype=np.int8)
+    return ranks, suits
+
+
+def eval_hands(ranks, suits):
+    ranks = np.sort(ranks, axis=1)
+    flush = (suits == suits[:, :1]).all(axis=1)
+
+    # histogram rang po posortowaniu: równe sąsiednie rangi, ich serie długości 3 i 4
+    same = ranks[:, 1:] == ranks[:, :-1]
+    pairs = same.sum(axis=1)
+    three = same[:, :-1] & same[:, 1:]
+    four = (three[:, :-1] & three[:, 1:]).any(axis=1)
+    three = three.any(axis=1)
+    straight = (pairs == 0) & (ranks[:, 4] - ranks[:, 0] == 4)
+
+    result = np.full(len(ranks), 9, dtype=np.int8)
+    result[pairs == 1] = 8  # para
+    result[pairs == 2] = 7  # dwie pary
+    result[(pairs == 2) & three] = 6  # trójka
+    result[(pairs == 3) & ~four] = 3  # full
+    result[(pairs == 3) & four] = 2  # kareta
+    result[flush] = 4  # kolor
+    result[straight] = 5  # strit
+    result[straight & flush] = 1  # poker
+    return result
+
+
+# losowanie bez zwracania: 5 pierwszych kroków tasowania Fishera-Yatesa, dla wszystkich rąk naraz
+def sample_hands(rng, deck, n):
+    ranks, suits = deck
+    m = len(ranks)
+    perm = np.tile(np.arange(m, dtype=np.int8), (n, 1))
+    rows = np.arange(n)
+    for k in range(5):
+        j = rng.integers(k, m, size=n)
+        picked = perm[rows, j]
+        perm[rows, j] = perm[:, k]
+        perm[:, k] = picked
+    idx = perm[:, :5]
+    return ranks[idx], suits[idx]
+
+
+def count_wins(b_deck, f_deck, n, rng=None, chunk_size=1_000_000):
+    if rng is None:
+        rng = np.random.default_rng()
+    b_deck = encode_deck(b_deck)
+    f_deck = encode_deck(f_deck)
+
+    wins = 0
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        b = eval_hands(*sample_hands(rng, b_deck, size))
+        f = eval_hands(*sample_hands(rng, f_deck, size))
+        wins += int((b < f).sum())
+    return wins
+
+
+# dokładny rozkład kategorii: wszystkie C(m, 5) rąk z talii, liczony raz dla danej zawartości talii
+def category_distribution(deck):
+    return _category_distribution(tuple(sorted(deck)))
+
+
+@cache
+def _category_distribution(deck):
+    ranks, suits = encode_deck(deck)
+    idx = np.array(list(combinations(range(len(deck)), 5)), dtype=np.int16).reshape(-1, 5)
+    counts = np.bincount(eval_hands(ranks[idx], suits[idx]), minlength=10)
+    return counts / counts.sum()
@@ -9,6 +9,10 @@ Przeprowadzam eksperymenty dla różnych wariantów jego talii (maksymalizujące
 from collections import namedtuple, Counter
 from random import sample
 
+import numpy as np
+
+from vectorized import count_wins, category_distribution
+
 Card = namedtuple("card", ["rank", "suit"])
 
 figures = [11, 12, 13, 14]  # J, Q, K, A
@@ -52,35 +56,44 @@ def experiment(b_deck=blot_deck):
     return 0
 
 
-def case(b_deck=blot_deck, n=100000):
-    s = 0
-    for _ in range(n):
-        s += experiment(b_deck)
-    return s / n
+# wszystkie n rozdań losujemy i oceniamy naraz (vectorized.py) zamiast n razy wołać experiment()
+def case(b_deck=blot_deck, n=100000, seed=None):
+    return count_wins(b_deck, fig_deck, n, np.random.default_rng(seed)) / n
+
+
+# bez losowania: P(wygrana blotkarza) = suma po kategoriach P(b = i) * P(f > i)
+def exact_case(b_deck=blot_deck):
+    b = category_distribution(b_deck)
+    f = category_distribution(fig_deck)
+    f_worse = np.cumsum(f[::-1])[::-1]  # f_worse[i] = P(f >= i)
+    return float(np.dot(b[1:9], f_worse[2:10]))
+
+
+poker_only_deck = [Card(2, -1), Card(3, -1), Card(4, -1), Card(5, -1), Card(6, -1)]
+one_color_deck = [Card(r, -1) for r in blots]
+two_quads_deck = [Card(r, s) for r in [9, 10] for s in suits]
+three_quads_deck = [Card(r, s) for r in [8, 9, 10] for s in suits]
 
 
 def always_win():
-    poker_only = [Card(2, -1), Card(3, -1), Card(4, -1), Card(5, -1), Card(6, -1)]
-    return case(poker_only)
+    return case(poker_only_deck)
 
 
 def one_color():
-    color = [Card(r, -1) for r in blots]
-    return case(color)
+    return case(one_color_deck)
 
 
 def two_quads():
-    quads = [Card(r, s) for r in [9, 10] for s in suits]
-    return case(quads)
+    return case(two_quads_deck)
 
 
 def three_quads():
-    quads = [Card(r, s) for r in [8, 9, 10] for s in suits]
-    return case(quads)
+    return case(three_quads_deck)
 
 
-print(f"All cards: {case()}")
-# print(f"5 cards: {always_win()}")
-# print(f"9 cards: {one_color()}")
-# print(f"8 cards: {two_quads()}")
-# print(f"12 cards: {three_quads()}")
+if __name__ == "__main__":
+    print(f"All cards: {case()}")
+    # print(f"5 cards: {always_win()}")
+    # print(f"9 cards: {one_color()}")
+    # print(f"8 cards: {two_quads()}")
+    # print(f"12 cards: {three_quads()}")
@@ -1,16 +1,43 @@
+import numpy as np
+
+
+# liczba zmian = (D - jedynki w oknie) + (jedynki poza oknem) = D + wszystkie jedynki - 2 * jedynki w oknie,
+# więc wystarczy przesuwać okno i pamiętać jego sumę
 def opt_dist(bits, D):
     n = len(bits)
+    total = sum(bits)
     if D == 0:
-        return sum(bits)
+        return total
+    if D > n:
+        return float('inf')
+
+    window = sum(bits[:D])
+    best_window = window
+    for i in range(D, n):
+        window += bits[i] - bits[i - D]
+        best_window = max(best_window, window)
+
+    return D + total - 2 * best_window
+
+
+# to samo dla wszystkich wierszy siatki naraz, każdy wiersz z własnym D (sumy prefiksowe)
+def opt_dist_batch(grid, D):
+    grid = np.asarray(grid, dtype=np.int64)
+    D = np.asarray(D, dtype=np.int64)
+    rows, n = grid.shape
 
-    min_changes = float('inf')
+    prefix = np.zeros((rows, n + 1), dtype=np.int64)
+    np.cumsum(grid, axis=1, out=prefix[:, 1:])
 
-    for i in range(n - D + 1):
-        window = bits[i:i + D]
-        changes = D - sum(window) + sum(bits[:i]) + sum(bits[i+D:])
-        min_changes = min(min_changes, changes)
+    starts = np.arange(n + 1)
+    ends = starts[None, :] + D[:, None]
+    windows = (np.take_along_axis(prefix, np.minimum(ends, n), axis=1) - prefix[:, starts])
+    windows[ends > n] = -1
 
-    return min_changes
+    result = (D + prefix[:, n] - 2 * windows.max(axis=1)).astype(float)
+    result[D == 0] = prefix[D == 0, n]
+    result[D > n] = float('inf')
+    return result
 
 
 assert opt_dist([0, 0, 1, 0, 0, 0, 1, 0, 0, 0], 5) == 3
@@ -19,3 +46,4 @@ assert opt_dist([0, 0, 1, 0, 0, 0, 1, 0, 0, 0], 3) == 3
 assert opt_dist([0, 0, 1, 0, 0, 0, 1, 0, 0, 0], 2) == 2
 assert opt_dist([0, 0, 1, 0, 0, 0, 1, 0, 0, 0], 1) == 1
 assert opt_dist([0, 0, 1, 0, 0, 0, 1, 0, 0, 0], 0) == 2
+assert list(opt_dist_batch([[0, 0, 1, 0, 0, 0, 1, 0, 0, 0]] * 6, [5, 4, 3, 2, 1, 0])) == [3, 4, 3, 2, 1, 2]
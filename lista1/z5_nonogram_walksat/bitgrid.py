@@ -0,0 +1,81 @@
+# plansza jako maski bitowe: każdy wiersz i każda kolumna to jedna liczba (bit i = komórka i),
+# oba widoki są aktualizowane razem, więc pobranie kolumny nic nie kopiuje
+class BitGrid:
+    def __init__(self, height: int, width: int):
+        self.height = height
+        self.width = width
+        self.rows = [0] * height
+        self.cols = [0] * width
+
+    def get(self, row: int, col: int) -> int:
+        return self.rows[row] >> col & 1
+
+    def set(self, row: int, col: int, value: int):
+        if value:
+            self.rows[row] |= 1 << col
+            self.cols[col] |= 1 << row
+        else:
+            self.rows[row] &= ~(1 << col)
+            self.cols[col] &= ~(1 << row)
+
+    def flip(self, row: int, col: int):
+        self.rows[row] ^= 1 << col
+        self.cols[col] ^= 1 << row
+
+    def set_row(self, row: int, mask: int):
+        changed = self.rows[row] ^ mask
+        self.rows[row] = mask
+        for col in mask_bits(changed):
+            self.cols[col] ^= 1 << row
+
+    def set_col(self, col: int, mask: int):
+        changed = self.cols[col] ^ mask
+        self.cols[col] = mask
+        for row in mask_bits(changed):
+            self.rows[row] ^= 1 << col
+
+    def copy(self):
+        other = BitGrid(self.height, self.width)
+        other.rows = self.rows[:]
+        other.cols = self.cols[:]
+        return other
+
+    def row_list(self, row: int) -> [int]:
+        return mask_to_line(self.rows[row], self.width)
+
+    def col_list(self, col: int) -> [int]:
+        return mask_to_line(self.cols[col], self.height)
+
+    # iteracja jak po liście list - dla wypisywania i zapisu rozwiązania
+    def __iter__(self):
+        return (self.row_list(r) for r in range(self.height))
+
+
+def mask_bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def line_to_mask(line) -> int:
+    mask = 0
+    for i, cell in enumerate(line):
+        if cell:
+            mask |= 1 << i
+    return mask
+
+
+def mask_to_line(mask: int, n: int) -> [int]:
+    return [mask >> i & 1 for i in range(n)]
+
+
+# długości kolejnych bloków jedynek, od bitu 0
+def mask_blocks(mask: int) -> [int]:
+    blocks = []
+    while mask:
+        mask >>= (mask & -mask).bit_length() - 1  # zera przed blokiem
+        length = (~mask & (mask + 1)).bit_length() - 1  # długość serii jedynek
+        blocks.append(length)
+        mask >>= length
+    return blocks
@@ -1,6 +1,7 @@
-from random import random, choice
+from random import random, choice, randrange
 from time import time
-from utils import check_line_quality, is_line_valid
+from bitgrid import BitGrid
+from utils import get_blocks, blocks_quality, are_blocks_valid
 
 
 class Image:
@@ -13,21 +14,41 @@ class Image:
         # stan
         self.best_score = float('-inf')
         self.best_grid = None
-        self.grid = []
+        self.grid = BitGrid(y, x)
+        # pamięć podręczna dla każdej linii: bloki, ocena i poprawność - po odwróceniu komórki
+        # przeliczamy tylko jej wiersz i kolumnę
+        self.row_blocks = []
+        self.col_blocks = []
+        self.row_scores = []
+        self.col_scores = []
+        self.row_valid = []
+        self.col_valid = []
+        self.invalid_count = 0
         self.current_score = 0
+        # statystyki ostatniego solve()
+        self.stats = {"iterations": 0, "restarts": 0, "time": 0.0}
         self.reset_grid()
 
     def reset_grid(self):
-        self.grid = [[0 for _ in range(self.x)] for _ in range(self.y)]
-        self.current_score = self.calculate_total_score()
+        self.grid = BitGrid(self.y, self.x)
+        self.rescan()
+
+    # pełne przeliczenie pamięci podręcznej - tylko przy resecie albo podmianie całej siatki
+    def rescan(self):
+        self.row_blocks = [get_blocks(row) for row in self.grid.rows]
+        self.col_blocks = [get_blocks(col) for col in self.grid.cols]
+        self.row_scores = [blocks_quality(self.row_blocks[r], self.rows[r]) for r in range(self.y)]
+        self.col_scores = [blocks_quality(self.col_blocks[c], self.cols[c]) for c in range(self.x)]
+        self.row_valid = [are_blocks_valid(self.row_blocks[r], self.rows[r]) for r in range(self.y)]
+        self.col_valid = [are_blocks_valid(self.col_blocks[c], self.cols[c]) for c in range(self.x)]
+        self.invalid_count = self.row_valid.count(False) + self.col_valid.count(False)
+        self.current_score = sum(self.row_scores) + sum(self.col_scores)
 
     def calculate_row_score(self, row_index):
-        row = self.grid[row_index]
-        return check_line_quality(row, self.rows[row_index])
+        return blocks_quality(get_blocks(self.grid.rows[row_index]), self.rows[row_index])
 
     def calculate_col_score(self, col_index):
-        col = [self.grid[row][col_index] for row in range(self.y)]
-        return check_line_quality(col, self.cols[col_index])
+        return blocks_quality(get_blocks(self.grid.cols[col_index]), self.cols[col_index])
 
     def calculate_total_score(self):
         row_scores = sum(self.calculate_row_score(r) for r in range(self.y))
@@ -35,48 +56,52 @@ class Image:
         return row_scores + col_scores
 
     def is_solved(self):
-        for r in range(self.y):
-            if not is_line_valid(self.grid[r], self.rows[r]):
-                return False
+        return self.invalid_count == 0
 
-        for c in range(self.x):
-            column = [self.grid[r][c] for r in range(self.y)]
-            if not is_line_valid(column, self.cols[c]):
-                return False
-        return True
+    # odwrócenie komórki z aktualizacją jej wiersza i kolumny
+    def flip(self, row_index, col_index):
+        self.grid.flip(row_index, col_index)
+
+        row_blocks = get_blocks(self.grid.rows[row_index])
+        row_score = blocks_quality(row_blocks, self.rows[row_index])
+        row_valid = are_blocks_valid(row_blocks, self.rows[row_index])
+        col_blocks = get_blocks(self.grid.cols[col_index])
+        col_score = blocks_quality(col_blocks, self.cols[col_index])
+        col_valid = are_blocks_valid(col_blocks, self.cols[col_index])
+
+        self.current_score += (row_score - self.row_scores[row_index]) + (col_score - self.col_scores[col_index])
+        self.invalid_count += (self.row_valid[row_index] - row_valid) + (self.col_valid[col_index] - col_valid)
+
+        self.row_blocks[row_index] = row_blocks
+        self.row_scores[row_index] = row_score
+        self.row_valid[row_index] = row_valid
+        self.col_blocks[col_index] = col_blocks
+        self.col_scores[col_index] = col_score
+        self.col_valid[col_index] = col_valid
 
     # obliczamy, czy odwrócenie komórki wychodzi nam na +
     def neg_cell_score(self, row_index, col_index):
-        old_row_score = self.calculate_row_score(row_index)
-        old_col_score = self.calculate_col_score(col_index)
-
-        self.grid[row_index][col_index] = 1 - self.grid[row_index][col_index]
+        self.grid.flip(row_index, col_index)
 
         new_row_score = self.calculate_row_score(row_index)
         new_col_score = self.calculate_col_score(col_index)
 
-        self.grid[row_index][col_index] = 1 - self.grid[row_index][col_index]
+        self.grid.flip(row_index, col_index)
 
-        return (new_row_score + new_col_score) - (old_row_score + old_col_score)
+        return (new_row_score + new_col_score) - (self.row_scores[row_index] + self.col_scores[col_index])
 
     def get_invalid_lines(self):
-        invalid_rows = []
-        for r in range(self.y):
-            if not is_line_valid(self.grid[r], self.rows[r]):
-                invalid_rows.append(r)
-
-        invalid_cols = []
-        for c in range(self.x):
-            column = [self.grid[r][c] for r in range(self.y)]
-            if not is_line_valid(column, self.cols[c]):
-                invalid_cols.append(c)
-
+        invalid_rows = [r for r in range(self.y) if not self.row_valid[r]]
+        invalid_cols = [c for c in range(self.x) if not self.col_valid[c]]
         return invalid_rows, invalid_cols
 
-    def solve(self, max_iterations=200000, timeout=10, restart_after=1000):
+    # noise - prawdopodobieństwo odwrócenia losowej komórki wybranej linii zamiast najlepszej,
+    # stop - opcjonalne zdarzenie (np. multiprocessing.Event), po którym przerywamy szukanie
+    def solve(self, max_iterations=200000, timeout=10, restart_after=1000, noise=0.0, stop=None):
         start_time = time()
         best_score = float('-inf')
         iterations_since_improvement = 0
+        self.stats = {"iterations": 0, "restarts": 0, "time": 0.0}
 
         iteration = 0
         while iteration < max_iterations and time() - start_time < timeout:
@@ -84,12 +109,16 @@ class Image:
 
             # jeśli sprawdzona, to kończymy
             if self.is_solved():
-                return True
+                break
+
+            # ktoś inny już skończył - sprawdzamy co jakiś czas, bo to wymaga synchronizacji
+            if stop is not None and iteration % 64 == 0 and stop.is_set():
+                break
 
             # liczymy iteracje od ostatniej poprawy, zeby wiedzieć, kiedy utkniemy
             if self.current_score > best_score:
                 best_score = self.current_score
-                self.best_grid = [row[:] for row in self.grid]
+                self.best_grid = self.grid.copy()
                 iterations_since_improvement = 0
             else:
                 iterations_since_improvement += 1
@@ -97,6 +126,7 @@ class Image:
             # ... wtedy restart
             if iterations_since_improvement > restart_after:
                 self.reset_grid()
+                self.stats["restarts"] += 1
                 iterations_since_improvement = 0
                 continue
 
@@ -116,6 +146,8 @@ class Image:
                         best_cell = col
 
                 col_index = best_cell
+                if noise and random() < noise:
+                    col_index = randrange(self.x)
 
             # ... albo kolumnę
             else:
@@ -130,15 +162,18 @@ class Image:
                         best_cell = row
 
                 row_index = best_cell
+                if noise and random() < noise:
+                    row_index = randrange(self.y)
 
-            # negujemy wybraną komórkę
-            self.grid[row_index][col_index] = 1 - self.grid[row_index][col_index]
+            # negujemy wybraną komórkę (score aktualizuje się przy okazji)
+            self.flip(row_index, col_index)
 
-            # aktualizujemy score
-            self.current_score = self.calculate_total_score()
+        self.stats["iterations"] = iteration
+        self.stats["time"] = time() - start_time
 
         if self.best_grid and not self.is_solved():
             self.grid = self.best_grid
+            self.rescan()
 
         return self.is_solved()
 
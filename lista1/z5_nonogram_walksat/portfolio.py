@@ -0,0 +1,67 @@
+import random
+from multiprocessing import Process, Queue, Event
+from time import time
+
+from image import Image
+
+
+# wynik wysyłamy zawsze, także po wyjątku - inaczej solve_portfolio czekałby na niego w nieskończoność
+def run_worker(rows, cols, x, y, seed, noise, timeout, stop, results):
+    random.seed(seed)
+    start_time = time()
+    try:
+        image = Image(rows, cols, x, y)
+        solved = image.solve(max_iterations=float('inf'), timeout=timeout, noise=noise, stop=stop)
+    except Exception as e:
+        results.put({
+            "seed": seed,
+            "noise": noise,
+            "solved": False,
+            "iterations": None,
+            "iterations_per_second": None,
+            "restarts": None,
+            "time_to_solution": None,
+            "grid": None,
+            "error": repr(e),
+        })
+        return
+
+    if solved:
+        stop.set()
+
+    elapsed = time() - start_time
+    results.put({
+        "seed": seed,
+        "noise": noise,
+        "solved": solved,
+        "iterations": image.stats["iterations"],
+        "iterations_per_second": image.stats["iterations"] / max(image.stats["time"], 1e-9),
+        "restarts": image.stats["restarts"],
+        "time_to_solution": elapsed if solved else None,
+        "grid": list(image.grid) if solved else None,
+        "error": None,
+    })
+
+
+# portfel niezależnych WalkSAT-ów: każdy proces ma własne ziarno i poziom szumu,
+# pierwszy, który rozwiąże obrazek, zatrzymuje pozostałe
+def solve_portfolio(rows, cols, x, y, workers=4, timeout=10, seed=0, noises=(0.0, 0.05, 0.1, 0.2)):
+    stop = Event()
+    results = Queue()
+    processes = [Process(target=run_worker,
+                         args=(rows, cols, x, y, seed + i, noises[i % len(noises)], timeout, stop, results))
+                 for i in range(workers)]
+    for p in processes:
+        p.start()
+
+    # wyniki odbieramy przed join, żeby proces nie czekał na opróżnienie kolejki
+    stats = [results.get() for _ in processes]
+    for p in processes:
+        p.join()
+
+    stats.sort(key=lambda s: s["seed"])
+    solutions = [s for s in stats if s["solved"]]
+    grid = min(solutions, key=lambda s: s["time_to_solution"])["grid"] if solutions else None
+    for s in stats:
+        del s["grid"]
+    return grid, stats
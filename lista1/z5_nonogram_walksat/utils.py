@@ -1,22 +1,17 @@
-def get_blocks(line):
-    blocks = []
-    current_length = 0
-    for i in line:
-        if i == 1:
-            current_length += 1
-        else:
-            if current_length > 0:
-                blocks.append(current_length)
-                current_length = 0
+from bitgrid import mask_blocks, line_to_mask
 
-    if current_length > 0:
-        blocks.append(current_length)
 
-    return blocks
+# linia to maska bitowa (bit i = komórka i); lista 0/1 też zadziała, ale wymaga konwersji
+def get_blocks(line):
+    if not isinstance(line, int):
+        line = line_to_mask(line)
+    return mask_blocks(line)
 
 def check_line_quality(line, spec):
-    line_blocks = get_blocks(line)
+    return blocks_quality(get_blocks(line), spec)
 
+# ocena linii na podstawie już policzonych bloków
+def blocks_quality(line_blocks, spec):
     # idealnie zgodna ze specyfikacją
     if line_blocks == [spec]:
         return 100
@@ -37,7 +32,10 @@ def check_line_quality(line, spec):
     return 50 - (size_diff * 10)
 
 def is_line_valid(line, spec):
-    return get_blocks(line) == ([spec] if spec else [])
+    return are_blocks_valid(get_blocks(line), spec)
+
+def are_blocks_valid(line_blocks, spec):
+    return line_blocks == ([spec] if spec else [])
 
 def parse_file(input_file):
     with open(input_file, 'r') as f:
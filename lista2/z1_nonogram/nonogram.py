@@ -1,10 +1,12 @@
 from random import random, choice, randint
 from time import time
 
-from lista2.z1.utils import calculate_line_score, str_cell, calculate_guaranteed_cells
+from lista1.z5_nonogram_walksat.bitgrid import BitGrid, line_to_mask
+from lista2.z1_nonogram.utils import make_line_scorer, str_cell, line_cache, restart_budgets
 
 
 # {0: pusta, 1: pełna, 2: gwarantowana}
+# plansza trzymana jako maski bitowe: grid - pola pełne, fixed - pola gwarantowane (zawsze też pełne)
 
 class Nonogram:
     def __init__(self, row_definitions: [int], col_definitions: [int]):
@@ -16,27 +18,38 @@ class Nonogram:
         self.best_grid = None
         self.row_scores = [0] * self.height
         self.col_scores = [0] * self.width
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        self.grid = BitGrid(self.height, self.width)
+        self.fixed = BitGrid(self.height, self.width)
         self.rows_combinations = []
         self.cols_combinations = []
+        self.row_scorers = []
+        self.col_scorers = []
         self.reset_grid()
 
     def set_cell(self, row: int, col: int, value: int):
-        self.grid[row][col] = value
+        self.grid.set(row, col, value > 0)
+        self.fixed.set(row, col, value == 2)
+
+    def get_cell(self, row: int, col: int) -> int:
+        return self.grid.get(row, col) + self.fixed.get(row, col)
 
     def get_row(self, row_num: int):
-        return self.grid[row_num]
+        return self._line(self.grid.rows[row_num], self.fixed.rows[row_num], self.width)
 
     def get_col(self, col_num: int):
-        return [self.grid[i][col_num] for i in range(self.height)]
+        return self._line(self.grid.cols[col_num], self.fixed.cols[col_num], self.height)
+
+    @staticmethod
+    def _line(filled: int, fixed: int, n: int) -> [int]:
+        return [(filled >> i & 1) + (fixed >> i & 1) for i in range(n)]
 
     def set_row(self, row_num: int, new_row_value: [int]):
-        for i in range(self.width):
-            self.grid[row_num][i] = new_row_value[i]
+        self.grid.set_row(row_num, line_to_mask(new_row_value))
+        self.fixed.set_row(row_num, line_to_mask(v == 2 for v in new_row_value))
 
     def set_col(self, col_num: int, new_col_value: [int]):
-        for i in range(self.height):
-            self.grid[i][col_num] = new_col_value[i]
+        self.grid.set_col(col_num, line_to_mask(new_col_value))
+        self.fixed.set_col(col_num, line_to_mask(v == 2 for v in new_col_value))
 
     def display(self):
         max_row_len = max(len(row) for row in self.row_defs)
@@ -50,7 +63,7 @@ class Nonogram:
 
         row_headers = [" ".join(map(str, row)).rjust(max_row_len * 2) for row in self.row_defs]
 
-        board_rows = [" ".join(map(str_cell, row)) for row in self.grid]
+        board_rows = [" ".join(map(str_cell, self.get_row(r))) for r in range(self.height)]
 
         col_header_str = "\n".join(" " * (max_row_len * 2 + 1) + " ".join(row) for row in col_headers)
         board_str = "\n".join(f"{row_headers[i]} {board_rows[i]}" for i in range(self.height))
@@ -58,10 +71,12 @@ class Nonogram:
         return f"{col_header_str}\n{board_str}"
 
     def calculate_initial_board_score(self):
-        for r in range(self.height):
-            self.row_scores[r] = calculate_line_score(self.get_row(r), self.row_defs[r], self.rows_combinations[r])
-        for c in range(self.width):
-            self.col_scores[c] = calculate_line_score(self.get_col(c), self.col_defs[c], self.cols_combinations[c])
+        self.row_scorers = [make_line_scorer(self.rows_combinations[r], self.row_defs[r], self.get_row(r))
+                            for r in range(self.height)]
+        self.col_scorers = [make_line_scorer(self.cols_combinations[c], self.col_defs[c], self.get_col(c))
+                            for c in range(self.width)]
+        self.row_scores = [scorer.score for scorer in self.row_scorers]
+        self.col_scores = [scorer.score for scorer in self.col_scorers]
         total_score = sum(self.row_scores) + sum(self.col_scores)
         self.current_score = total_score
 
@@ -82,58 +97,71 @@ class Nonogram:
         return invalid_rows, invalid_cols
 
     def reset_grid(self):
+        self.fixed = BitGrid(self.height, self.width)
+        self.cols_combinations = []
+        self.rows_combinations = []
         for i in range(len(self.col_defs)):
-            r, c = calculate_guaranteed_cells(self.col_defs[i], self.height)
-            self.set_col(i, r)
+            r, c = line_cache.get(self.col_defs[i], self.height)
+            self.fixed.set_col(i, line_to_mask(r))
             self.cols_combinations.append(c)
         for j in range(len(self.row_defs)):
-            guaranteed, c = calculate_guaranteed_cells(self.row_defs[j], self.width)
+            guaranteed, c = line_cache.get(self.row_defs[j], self.width)
             self.rows_combinations.append(c)
-            for i in range(self.width):
-                if guaranteed[i] == 2:
-                    self.grid[j][i] = 2
+            self.fixed.set_row(j, self.fixed.rows[j] | line_to_mask(guaranteed))
+        # wszystkie niegwarantowane pola puste
+        self.grid = self.fixed.copy()
         self.calculate_initial_board_score()
 
     def neg_cell_score(self, row_index: int, col_index: int) -> tuple[int, int, int]:
-        if self.grid[row_index][col_index] < 2:
-            self.grid[row_index][col_index] = 1 - self.grid[row_index][col_index]
-
-            new_row_score = calculate_line_score(self.get_row(row_index), self.row_defs[row_index], self.rows_combinations[row_index])
-            new_col_score = calculate_line_score(self.get_col(col_index), self.col_defs[col_index], self.cols_combinations[col_index])
-
-            self.grid[row_index][col_index] = 1 - self.grid[row_index][col_index]
+        if not self.fixed.get(row_index, col_index):
+            new_row_score = self.row_scorers[row_index].score_if_flipped(col_index)
+            new_col_score = self.col_scorers[col_index].score_if_flipped(row_index)
 
             return ((new_row_score + new_col_score) - (self.row_scores[row_index] + self.col_scores[col_index]),
                     new_row_score, new_col_score)
         return 0, self.row_scores[row_index], self.col_scores[col_index]
 
-    def solve(self, timeout=120, restart_after=100, random_change=0.01):
-        max_iterations = self.width * self.height * 30
+    # restart_policy - limity iteracji kolejnych przebiegów (patrz restart_budgets);
+    # po upływie timeout kończymy i zostawiamy najlepszą znalezioną dotąd planszę
+    def solve(self, timeout=120, restart_after=100, random_change=0.01, restart_policy="luby"):
         start_time = time()
-        best_score = float('-inf')
+        budgets = restart_budgets(self.width * self.height * 30, restart_policy)
+        run_budget = next(budgets)
+        best_score = float('-inf')  # w bieżącym przebiegu
+        overall_best_score = float('-inf')
         iterations_since_improvement = 0
+        self.stats = {"iterations": 0, "restarts": 0, "time": 0.0}
 
         iteration = 0
-        while True:
-            # jeśli sprawdzona, to kończymy
-            if self.is_solved():
-                return True
-
+        # jeśli sprawdzona, to kończymy
+        while not self.is_solved() and time() - start_time < timeout:
+            self.stats["iterations"] += 1
             iteration += 1
-            if iteration > max_iterations:
-                return self.solve()
+
+            # przebieg wyczerpał limit - zaczynamy nowy od samych pól gwarantowanych
+            if iteration > run_budget:
+                self.reset_grid()
+                self.stats["restarts"] += 1
+                run_budget = next(budgets)
+                iteration = 0
+                best_score = float('-inf')
+                iterations_since_improvement = 0
+                continue
 
             # liczymy iteracje od ostatniej poprawy, zeby wiedzieć, kiedy utkniemy
             if self.current_score > best_score:
                 best_score = self.current_score
-                self.best_grid = [row[:] for row in self.grid]
                 iterations_since_improvement = 0
+                if best_score > overall_best_score:
+                    overall_best_score = best_score
+                    self.best_grid = self.grid.copy()
             else:
                 iterations_since_improvement += 1
 
             # ... wtedy restart
             if iterations_since_improvement > restart_after:
                 self.reset_grid()
+                self.stats["restarts"] += 1
                 iterations_since_improvement = 0
                 continue
 
@@ -179,8 +207,10 @@ class Nonogram:
                 best_improvement, new_row_score, new_col_score = self.neg_cell_score(row_index, col_index)
 
             # negujemy wybraną komórkę
-            if self.grid[row_index][col_index] < 2:
-                self.grid[row_index][col_index] = 1 - self.grid[row_index][col_index]
+            if not self.fixed.get(row_index, col_index):
+                self.grid.flip(row_index, col_index)
+                self.row_scorers[row_index].flip(col_index)
+                self.col_scorers[col_index].flip(row_index)
 
             # aktualizujemy score
             # print(f"Changing: {row_index, col_index}, old scores: {self.row_scores[row_index], self.col_scores[col_index]}, new scores: {new_row_score, new_col_score}, improvement: {best_improvement}")
@@ -188,8 +218,11 @@ class Nonogram:
             self.row_scores[row_index] = new_row_score
             self.col_scores[col_index] = new_col_score
 
-        if self.best_grid and not self.is_solved():
+        self.stats["time"] = time() - start_time
+
+        if not self.is_solved() and self.current_score < overall_best_score:
             self.grid = self.best_grid
+            self.calculate_initial_board_score()
 
         return self.is_solved()
 
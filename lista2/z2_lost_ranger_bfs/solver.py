@@ -14,6 +14,15 @@ class CommandoSolver:
         self.goal_points = self._find_goal_points()
         self.possible_positions = set(self.start_points)
 
+        # plansza spłaszczona: pole (r, c) ma numer r * cols + c, a next_cell[d][i] to numer pola
+        # po ruchu w kierunku d (to samo pole, jeśli dalej jest ściana albo brzeg)
+        self.next_cell = self._compute_transitions()
+
+        # stan przekonań to jedna liczba: bit i ustawiony, jeśli komandos może stać na polu i;
+        # ruch w kierunku d to przesunięcie bitów z movable[d] o shifts[d], reszta zostaje w miejscu
+        self.movable, self.shifts = self._compute_move_masks()
+        self.start_mask = self._positions_mask(self.start_points)
+        self.goal_mask = self._positions_mask(self.goal_points)
 
     def _find_start_points(self) -> List[Tuple[int, int]]:
         result = []
@@ -38,41 +47,88 @@ class CommandoSolver:
             return True
         return False
 
+    def _cell(self, r: int, c: int) -> int:
+        return r * self.cols + c
+
+    def _compute_transitions(self) -> List[List[int]]:
+        directions = [("U", -1, 0), ("D", 1, 0), ("L", 0, -1), ("R", 0, 1)]
+        table = []
+        for _, dr, dc in directions:
+            moved = []
+            for r in range(self.rows):
+                for c in range(self.cols):
+                    new_r, new_c = r + dr, c + dc
+                    if self._is_valid_move(new_r, new_c):
+                        moved.append(self._cell(new_r, new_c))
+                    else:
+                        moved.append(self._cell(r, c))
+            table.append(moved)
+        return table
+
+    def _compute_move_masks(self) -> Tuple[List[int], List[int]]:
+        movable = []
+        for moved in self.next_cell:
+            mask = 0
+            for i, j in enumerate(moved):
+                if i != j:
+                    mask |= 1 << i
+            movable.append(mask)
+        return movable, [-self.cols, self.cols, -1, 1]
+
+    def _positions_mask(self, positions) -> int:
+        mask = 0
+        for r, c in positions:
+            mask |= 1 << self._cell(r, c)
+        return mask
+
+    def _mask_positions(self, mask: int) -> Set[Tuple[int, int]]:
+        result = set()
+        while mask:
+            low = mask & -mask
+            result.add(divmod(low.bit_length() - 1, self.cols))
+            mask ^= low
+        return result
+
+    def _move(self, mask: int, d: int) -> int:
+        moving = mask & self.movable[d]
+        shift = self.shifts[d]
+        moved = moving << shift if shift > 0 else moving >> -shift
+        return mask & ~self.movable[d] | moved
+
+    def _apply_moves(self, mask: int, moves: List[str]) -> int:
+        directions = ["U", "D", "L", "R"]
+        for move in moves:
+            mask = self._move(mask, directions.index(move))
+        return mask
+
 
     # redukcja niepewności
     def reduce_uncertainty_phase(self, max_moves: int = 150, look_ahead: int = 2):
         memo = {}
         moves = []
-        positions = set(self.start_points)
+        positions = self.start_mask
         directions = [("U", -1, 0), ("D", 1, 0), ("L", 0, -1), ("R", 0, 1)]
 
-        # print(f"Początkowa niepewność: {len(positions)} pozycji")
+        # print(f"Początkowa niepewność: {positions.bit_count()} pozycji")
 
         # szybkie zakończenie, jeśli już mamy maksymalnie 3 pozycje
-        if len(positions) <= 3:
-            # print(f"Już osiągnięto docelową niepewność ({len(positions)} pozycji)")
-            return moves, next(iter(positions))
+        if positions.bit_count() <= 3:
+            # print(f"Już osiągnięto docelową niepewność ({positions.bit_count()} pozycji)")
+            return moves, min(self._mask_positions(positions), default=None)
 
         for i in range(max_moves):
             # sprawdzamy wszystkie kierunki i bierzemy najlepszy
             best_dir = None
-            best_positions_count = len(positions)
+            best_positions_count = positions.bit_count()
             best_new_positions = None
 
-            for move_dir, dr, dc in directions:
-                new_positions = set()
-
+            for d, (move_dir, _, _) in enumerate(directions):
                 # Oblicz nowe pozycje dla tego kierunku
-                for r, c in positions:
-                    new_r, new_c = r + dr, c + dc
-                    if self._is_valid_move(new_r, new_c):
-                        new_positions.add((new_r, new_c))
-                    else:
-                        new_positions.add((r, c))
+                new_positions = self._move(positions, d)
 
                 # Wybierz kierunek dający najmniejszą liczbę pozycji
-                if len(new_positions) < best_positions_count:
-                    best_positions_count = len(new_positions)
+                if new_positions.bit_count() < best_positions_count:
+                    best_positions_count = new_positions.bit_count()
                     best_dir = move_dir
                     best_new_positions = new_positions
 
@@ -83,32 +139,26 @@ class CommandoSolver:
                     best_dir, best_new_positions = best_sequence[0]
                 else:
                     # Jeśli nadal nie znaleziono, wybierz kierunek losowo
-                    move_dir, dr, dc = random.choice(directions)
-                    best_dir = move_dir
-                    best_new_positions = set()
-                    for r, c in positions:
-                        new_r, new_c = r + dr, c + dc
-                        if self._is_valid_move(new_r, new_c):
-                            best_new_positions.add((new_r, new_c))
-                        else:
-                            best_new_positions.add((r, c))
+                    d = directions.index(random.choice(directions))
+                    best_dir = directions[d][0]
+                    best_new_positions = self._move(positions, d)
 
             # Wykonaj ruch
             moves.append(best_dir)
             positions = best_new_positions
-            # print(f"Ruch {i + 1}: {best_dir} - Pozostało pozycji: {len(positions)}")
+            # print(f"Ruch {i + 1}: {best_dir} - Pozostało pozycji: {positions.bit_count()}")
 
             # Warunek zakończenia - osiągnięto maksymalnie 3 pozycje
-            if len(positions) <= 3:
-                # print(f"Osiągnięto docelową niepewność ({len(positions)} pozycji)!")
+            if positions.bit_count() <= 3:
+                # print(f"Osiągnięto docelową niepewność ({positions.bit_count()} pozycji)!")
                 break
 
-        # print(f"Końcowa niepewność: {len(positions)} pozycji po {len(moves)} ruchach")
+        # print(f"Końcowa niepewność: {positions.bit_count()} pozycji po {len(moves)} ruchach")
 
         # Wyświetl planszę wynikową
-        # self._display_result_board(positions)
+        # self._display_result_board(self._mask_positions(positions))
 
-        return moves, next(iter(positions)) if positions else None
+        return moves, min(self._mask_positions(positions), default=None)
 
     def _display_result_board(self, positions):
         """Wyświetla planszę wynikową z pozycjami komandosów i celów."""
@@ -133,14 +183,13 @@ class CommandoSolver:
             print("".join(row))
 
     # szukanie sekwencji ruchów (czyli nie patrzymy na pojedynczy ruch, tylko od razu na 2)
-    def _look_ahead_reduction(self, positions: Set[Tuple[int, int]], depth: int = 2, memo=None):
+    def _look_ahead_reduction(self, positions: int, depth: int = 2, memo=None):
 
         if memo is None:
             memo = {}
 
-        positions_key = tuple(sorted(positions))
-        if (positions_key, depth) in memo:
-            return memo[(positions_key, depth)]
+        if (positions, depth) in memo:
+            return memo[(positions, depth)]
 
         if depth <= 0:
             return None
@@ -149,16 +198,10 @@ class CommandoSolver:
         best_sequence = None
         best_reduction = 0
 
-        for move_dir, dr, dc in directions:
-            new_positions = set()
-            for r, c in positions:
-                new_r, new_c = r + dr, c + dc
-                if self._is_valid_move(new_r, new_c):
-                    new_positions.add((new_r, new_c))
-                else:
-                    new_positions.add((r, c))
+        for d, (move_dir, _, _) in enumerate(directions):
+            new_positions = self._move(positions, d)
 
-            reduction = len(positions) - len(new_positions)
+            reduction = positions.bit_count() - new_positions.bit_count()
 
             if reduction > 0:
                 return [(move_dir, new_positions)]
@@ -166,58 +209,57 @@ class CommandoSolver:
             # Rekurencyjnie sprawdź następny poziom
             next_sequence = self._look_ahead_reduction(new_positions, depth - 1)
             if next_sequence:
-                total_reduction = len(positions) - len(next_sequence[-1][1])
+                total_reduction = positions.bit_count() - next_sequence[-1][1].bit_count()
                 if total_reduction > best_reduction:
                     best_reduction = total_reduction
                     best_sequence = [(move_dir, new_positions)] + next_sequence
 
-        memo[(positions_key, depth)] = best_sequence
+        memo[(positions, depth)] = best_sequence
         return best_sequence
 
 
     def find_path_to_goal(self, commando_pos: set[Tuple[int, int]]) -> List[str]:
-        from collections import deque
-
-        queue = deque([(commando_pos, [])])
-        visited = {tuple(sorted(commando_pos))}
+        # stan jako maska bitowa - od razu nadaje się na klucz w visited; w kolejce tylko stan i długość
+        # ścieżki, a sama ścieżka jest odtwarzana na końcu z parents (stan -> (poprzedni stan, ruch))
+        start = self._positions_mask(commando_pos)
+        queue = deque([(start, 0)])
+        parents = {start: None}
         directions = [("U", -1, 0), ("D", 1, 0), ("L", 0, -1), ("R", 0, 1)]
         max_path = 150  # limit ścieżki
 
-        goal_points_set = set(self.goal_points)
-
         while queue:
-            current_positions, path = queue.popleft()
+            current_positions, length = queue.popleft()
 
-            if len(path) >= max_path:
+            if length >= max_path:
                 continue
 
-            # warunek końcowy
-            if all(pos in goal_points_set for pos in current_positions):
-                return path
+            # warunek końcowy - wszystkie możliwe pozycje są celami
+            if current_positions & ~self.goal_mask == 0:
+                return self._rebuild_path(parents, current_positions)
 
-            # ruch w każdym kierunku
-            for dir_name, dr, dc in directions:
-                new_positions = set()
-
-                # ... każdego komandosa
-                for r, c in current_positions:
-                    new_r, new_c = r + dr, c + dc
-                    if self._is_valid_move(new_r, new_c):
-                        new_positions.add((new_r, new_c))
-                    else:
-                        new_positions.add((r, c))
+            # ruch w każdym kierunku - wszyscy komandosi naraz
+            for d, (dir_name, _, _) in enumerate(directions):
+                new_state = self._move(current_positions, d)
 
-                if new_positions == current_positions:
+                if new_state == current_positions:
                     continue
 
                 # sprawdzamy czy stan nie wystąpił wcześniej
-                new_state = tuple(sorted(new_positions))
-                if new_state not in visited:
-                    visited.add(new_state)
-                    queue.append((new_positions, path + [dir_name]))
+                if new_state not in parents:
+                    parents[new_state] = (current_positions, dir_name)
+                    queue.append((new_state, length + 1))
 
         return []
 
+    @staticmethod
+    def _rebuild_path(parents, state) -> List[str]:
+        path = []
+        while parents[state] is not None:
+            state, dir_name = parents[state]
+            path.append(dir_name)
+        path.reverse()
+        return path
+
     def solve(self) -> str:
         # faza 1: redukcja niepewności
         reduction_moves, _ = self.reduce_uncertainty_phase(
@@ -226,40 +268,16 @@ class CommandoSolver:
             # random_treshhold=0.6
         )
 
-        current_positions = set()
-
-        dir_offsets = {
-            "U": (-1, 0), "D": (1, 0), "L": (0, -1), "R": (0, 1)
-        }
-
         # wykonuję pozycje dążące do redukcji
-        for start in self.start_points:
-            pos = start
-            for move in reduction_moves:
-                dr, dc = dir_offsets[move]
-                new_r, new_c = pos[0] + dr, pos[1] + dc
-                if self._is_valid_move(new_r, new_c):
-                    pos = (new_r, new_c)
-            current_positions.add(pos)
+        current_positions = self._mask_positions(self._apply_moves(self.start_mask, reduction_moves))
 
         # Faza 2: bfs
         path_to_goal = self.find_path_to_goal(current_positions)
 
         if len(reduction_moves) + len(path_to_goal) > 150:
             reduction_moves, _ = self.reduce_uncertainty_phase(max_moves=15)
-
-            current_positions = set()
-            for start in self.start_points:
-                pos = start
-                for move in reduction_moves:
-                    dr, dc = dir_offsets[move]
-                    new_r, new_c = pos[0] + dr, pos[1] + dc
-                    if self._is_valid_move(new_r, new_c):
-                        pos = (new_r, new_c)
-                current_positions.add(pos)
-
+            current_positions = self._mask_positions(self._apply_moves(self.start_mask, reduction_moves))
             path_to_goal = self.find_path_to_goal(current_positions)
 
         # Połączenie pozycji w 1 ścieżkę (dojście do redukcji + szukanie celu)
         return "".join(reduction_moves + path_to_goal)
-
@@ -0,0 +1,123 @@
+from collections import deque
+
+# {-1: nieznane, 0: puste, 1: pełne}
+UNKNOWN = -1
+EMPTY = 0
+FILLED = 1
+
+
+# rozwiązanie jednej linii przy częściowej wiedzy, O(n * k): stan (i, j) oznacza, że pola przed i
+# są ustalone, ułożono j bloków i na polu i może zacząć się kolejny blok;
+# forward - stany osiągalne od (0, 0), backward - stany, z których da się dojść do (n, k)
+# zwraca linię z dopisanymi polami wspólnymi dla wszystkich ustawień albo None przy sprzeczności
+def solve_line(line: [int], blocks: [int]):
+    n = len(line)
+    blocks = [b for b in blocks if b > 0]
+    k = len(blocks)
+
+    empties = [0] * (n + 1)
+    for i in range(n):
+        empties[i + 1] = empties[i] + (line[i] == EMPTY)
+
+    def can_empty(i):
+        return line[i] != FILLED
+
+    # blok j na polach [i, i + b) i pusty separator za nim (jeśli nie koniec linii)
+    def block_end(i, j):
+        end = i + blocks[j]
+        if end > n or empties[end] - empties[i] > 0:
+            return None
+        if end == n:
+            return n
+        return end + 1 if can_empty(end) else None
+
+    forward = [[False] * (k + 1) for _ in range(n + 1)]
+    forward[0][0] = True
+    for i in range(n):
+        for j in range(k + 1):
+            if not forward[i][j]:
+                continue
+            if can_empty(i):
+                forward[i + 1][j] = True
+            if j < k and (end := block_end(i, j)) is not None:
+                forward[end][j + 1] = True
+
+    if not forward[n][k]:
+        return None
+
+    backward = [[False] * (k + 1) for _ in range(n + 1)]
+    backward[n][k] = True
+    for i in range(n - 1, -1, -1):
+        for j in range(k, -1, -1):
+            if can_empty(i) and backward[i + 1][j]:
+                backward[i][j] = True
+            elif j < k and (end := block_end(i, j)) is not None and backward[end][j + 1]:
+                backward[i][j] = True
+
+    # które pola mogą być puste, a które pełne w jakimkolwiek poprawnym ustawieniu
+    may_empty = [False] * n
+    fill_diff = [0] * (n + 1)
+    for i in range(n):
+        for j in range(k + 1):
+            if not forward[i][j]:
+                continue
+            if can_empty(i) and backward[i + 1][j]:
+                may_empty[i] = True
+            if j < k and (end := block_end(i, j)) is not None and backward[end][j + 1]:
+                fill_diff[i] += 1
+                fill_diff[i + blocks[j]] -= 1
+                if end > i + blocks[j]:
+                    may_empty[i + blocks[j]] = True
+
+    result = []
+    may_fill = 0
+    for i in range(n):
+        may_fill += fill_diff[i]
+        if may_fill > 0 and may_empty[i]:
+            result.append(UNKNOWN)
+        elif may_fill > 0:
+            result.append(FILLED)
+        else:
+            result.append(EMPTY)
+    return result
+
+
+# propagacja do punktu stałego: kolejka linii do sprawdzenia, a po każdej zmianie pola
+# wraca do niej tylko linia przecinająca; zwraca siatkę z -1/0/1 albo None przy sprzeczności
+def propagate(row_defs: [[int]], col_defs: [[int]], grid=None):
+    height, width = len(row_defs), len(col_defs)
+    if grid is None:
+        grid = [[UNKNOWN] * width for _ in range(height)]
+
+    queue = deque([("r", r) for r in range(height)] + [("c", c) for c in range(width)])
+    queued = {line for line in queue}
+
+    while queue:
+        line = queue.popleft()
+        queued.discard(line)
+        kind, index = line
+
+        if kind == "r":
+            current = grid[index]
+            solved = solve_line(current, row_defs[index])
+        else:
+            current = [grid[r][index] for r in range(height)]
+            solved = solve_line(current, col_defs[index])
+
+        if solved is None:
+            return None
+
+        for i, value in enumerate(solved):
+            if value == current[i]:
+                continue
+            if kind == "r":
+                grid[index][i] = value
+                crossing = ("c", i)
+            else:
+                grid[i][index] = value
+                crossing = ("r", i)
+            if crossing not in queued:
+                queued.add(crossing)
+                queue.append(crossing)
+
+    return grid
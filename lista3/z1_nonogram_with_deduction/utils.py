@@ -1,26 +1,64 @@
+from collections import OrderedDict
 from itertools import combinations
+from math import comb
 from random import choice
 
+import numpy as np
+
 
 # {0: pusta, 1: pełna, 2: gwarantowana}
 
+# kombinacje materializujemy tylko, jeśli jest ich nie więcej niż tyle - inaczej linię ocenia dp
+COMBINATIONS_BUDGET = 100_000
+
+
+# pola gwarantowane bez wyliczania kombinacji: blok i, przesunięty maksymalnie w lewo
+# i maksymalnie w prawo, w obu ustawieniach pokrywa część wspólną - tylko te pola są pewne
+# budget None - bieżąca wartość COMBINATIONS_BUDGET (odczytywana przy wywołaniu, więc można ją zmienić)
+def calculate_guaranteed_cells(blocks: [int], n: int, budget: int = None):
+    if budget is None:
+        budget = COMBINATIONS_BUDGET
+
+    # przy sprzecznym opisie poniższe indeksy wyszłyby poza linię
+    combinations_count = count_combinations(blocks, n)
+    if combinations_count == 0:
+        raise ValueError(f"Blocks {blocks} do not fit in a line of length {n}")
+
+    guaranteed = [0 for _ in range(n)]
+    left = 0
+    right = n - sum(blocks) - (len(blocks) - 1)  # najbardziej prawy początek pierwszego bloku
+    for b in blocks:
+        for k in range(right, left + b):
+            guaranteed[k] = 2
+        left += b + 1
+        right += b + 1
+
+    if combinations_count > budget:
+        return guaranteed, None
+    # kombinacje jako macierz logiczna (liczba kombinacji x n)
+    return guaranteed, np.array(list(iterate_combinations(blocks, n)), dtype=bool).reshape(-1, n)
+
+
+def count_combinations(blocks: [int], n: int) -> int:
+    free_places = n - sum(blocks) - (len(blocks) - 1)
+    return comb(len(blocks) + free_places, len(blocks)) if free_places >= 0 else 0
+
+
 # # https://towardsdatascience.com/solving-nonograms-with-120-lines-of-code-a7c6e0f627e4/
-def calculate_guaranteed_cells(blocks: [int], n: int) -> [int]:
-    guaranteed = [2 for _ in range(n)]  # na początku ustawiam wszystkie pola jako pewne
+# leniwe wyliczanie wszystkich ustawień bloków w linii
+def iterate_combinations(blocks: [int], n: int):
     # na koniec każdego bloku dodaję dodatkowe, zajęte pole (bo ono musi być puste)
     fixed_blocks = [blocks[i] + 1 for i in range(len(blocks) - 1)] + [blocks[-1]]
     free_places = n - sum(fixed_blocks)
     # możliwe pozycje startowe wg algorytmu z linku - na każdej z nich możemy ustawic początek bloku lub zostawić pustą
     positions = range(len(fixed_blocks) + free_places)
-    combs = combinations(positions, len(fixed_blocks))
-    # teraz w pętli rzutuję wszystkie kombinacje na listę gwarantowanych; przekręcam wolne pola na 0
-    all_combs = []
-    for c in combs:
+    for c in combinations(positions, len(fixed_blocks)):
+        c = set(c)
         line = [0 for _ in range(n)]
         pointer = 0
         block_num = 0
         # odzyskiwanie linii z opisu kombinacji
-        for i in range(len(fixed_blocks) + free_places):
+        for i in positions:
             if i in c:
                 for j in range(pointer, pointer + blocks[block_num]):
                     line[j] = 1
@@ -28,24 +66,135 @@ def calculate_guaranteed_cells(blocks: [int], n: int) -> [int]:
                 block_num += 1
             else:
                 pointer += 1
-        all_combs.append(line)
-        for k in range(n):
-            if line[k] == 0:
-                guaranteed[k] = 0
-    return guaranteed, all_combs
+        yield line
+
 
-def calculate_line_score(line: [int], blocks: [int], combs: [[int]]) -> int:
+# minimalna liczba różnic między linią a dowolnym poprawnym ustawieniem bloków, O(n * k):
+# best[i][j] - najmniejszy koszt prefiksu długości i z j ułożonymi blokami (pole i może zacząć blok)
+def min_line_distance(line: [int], blocks: [int]) -> int:
     n = len(line)
-    # teraz w pętli rzutuję wszystkie kombinacje na aktualną linię
-    best_match = float("-inf")
-    for c in combs:
-        # porównanie linii do aktualnej
-        score = 0
-        for k in range(n):
-            if (line[k] >= 1) == (c[k] >= 1):
-                score += 1
-        best_match = max(best_match, score)
-    return best_match
+    blocks = [b for b in blocks if b > 0]
+    filled = [0] * (n + 1)
+    for i in range(n):
+        filled[i + 1] = filled[i] + (line[i] >= 1)
+
+    inf = float("inf")
+    best = [[inf] * (len(blocks) + 1) for _ in range(n + 2)]
+    best[0][0] = 0
+    for i in range(n + 1):
+        for j in range(len(blocks) + 1):
+            cost = best[i][j]
+            if cost == inf or i == n:
+                continue
+            # pole i puste
+            best[i + 1][j] = min(best[i + 1][j], cost + (line[i] >= 1))
+            # blok j od pola i, a za nim puste pole (o ile linia się nie kończy)
+            if j < len(blocks) and i + blocks[j] <= n:
+                end = i + blocks[j]
+                block_cost = cost + blocks[j] - (filled[end] - filled[i])
+                if end == n:
+                    best[n][j + 1] = min(best[n][j + 1], block_cost)
+                else:
+                    best[end + 1][j + 1] = min(best[end + 1][j + 1], block_cost + (line[end] >= 1))
+    return best[n][len(blocks)]
+
+
+# wspólna dla całego procesu pamięć wyników calculate_guaranteed_cells - wiele wierszy i kolumn
+# ma identyczne opisy, a restarty nie muszą niczego liczyć od nowa; najdawniej używane wypadają;
+# budget jak w calculate_guaranteed_cells - jest częścią klucza, więc jego zmiana nie zwraca starych wyników
+class LineCache:
+    def __init__(self, maxsize: int = 4096, budget: int = None):
+        self.maxsize = maxsize
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def get(self, blocks: [int], n: int):
+        budget = COMBINATIONS_BUDGET if self.budget is None else self.budget
+        key = (tuple(blocks), n, budget)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        value = calculate_guaranteed_cells(blocks, n, budget)
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize,
+                "budget": self.budget}
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+line_cache = LineCache()
+
+
+# ciąg Luby'ego (od i = 1): 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+def luby(i: int) -> int:
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+# limity iteracji kolejnych przebiegów między restartami: "luby" - unit razy ciąg Luby'ego,
+# "geometric" - unit, unit * factor, unit * factor^2, ...
+def restart_budgets(unit: int, policy: str = "luby", factor: float = 1.5):
+    i = 1
+    while True:
+        if policy == "luby":
+            yield unit * luby(i)
+        elif policy == "geometric":
+            yield int(unit * factor ** (i - 1))
+        else:
+            raise ValueError(f"Unknown restart policy: {policy}")
+        i += 1
+
+
+# najlepsze dopasowanie linii do którejś kombinacji = max po kombinacjach z (n - liczba różnic)
+def calculate_line_score(line: [int], blocks: [int], combs: np.ndarray) -> int:
+    if combs is None:
+        return len(line) - min_line_distance(line, blocks)
+    line = np.asarray(line) >= 1
+    return int((combs == line).sum(axis=1).max())
+
+
+def make_line_scorer(combs, blocks: [int], line: [int]):
+    if combs is None:
+        return DistanceLineScorer(blocks, line)
+    return LineScorer(combs, line)
+
+
+# ocena jednej linii trzymana przyrostowo: dla każdej kombinacji pamiętamy liczbę zgodnych pól,
+# odwrócenie pola k zmienia ją o +-1, więc ocena po odwróceniu to jedno przejście po kolumnie k macierzy
+class LineScorer:
+    def __init__(self, combs: np.ndarray, line: [int]):
+        self.combs = combs
+        self.line = np.asarray(line) >= 1
+        self.matches = (combs == self.line).sum(axis=1)
+        self.score = int(self.matches.max())
+
+    def _delta(self, k: int) -> np.ndarray:
+        # kombinacje zgodne na polu k tracą zgodność, pozostałe ją zyskują
+        return np.where(self.combs[:, k] == self.line[k], -1, 1)
+
+    def score_if_flipped(self, k: int) -> int:
+        return int((self.matches + self._delta(k)).max())
+
+    def flip(self, k: int):
+        self.matches += self._delta(k)
+        self.line[k] = not self.line[k]
+        self.score = int(self.matches.max())
 
 def str_cell(cell: int):
     if cell > 0:
@@ -53,3 +202,18 @@ def str_cell(cell: int):
     return "."
 
 
+# ten sam interfejs co LineScorer, ale bez macierzy kombinacji - każda ocena to jedno dp
+class DistanceLineScorer:
+    def __init__(self, blocks: [int], line: [int]):
+        self.blocks = blocks
+        self.line = [int(x >= 1) for x in line]
+        self.score = len(self.line) - min_line_distance(self.line, blocks)
+
+    def score_if_flipped(self, k: int) -> int:
+        line = self.line[:]
+        line[k] = 1 - line[k]
+        return len(line) - min_line_distance(line, self.blocks)
+
+    def flip(self, k: int):
+        self.line[k] = 1 - self.line[k]
+        self.score = len(self.line) - min_line_distance(self.line, self.blocks)
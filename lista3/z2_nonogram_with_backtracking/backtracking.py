@@ -0,0 +1,156 @@
+from collections import deque
+from time import time
+
+from lista1.z5_nonogram_walksat.bitgrid import BitGrid, mask_bits
+from lista2.z1_nonogram.utils import line_cache, count_combinations
+from lista3.z1_nonogram_with_deduction.deduction import solve_line, UNKNOWN, FILLED, EMPTY
+
+
+# przeszukiwanie z nawrotami: po każdej decyzji propagacja tylko po liniach, które się zmieniły,
+# a zamiast kopiować planszę zapisujemy ustawione pola na ścieżce (trail) i przy nawrocie je cofamy;
+# plansza jak w Nonogram z dedukcją: grid - pola pełne, empty - pola puste, reszta nieustalona
+class BacktrackingSolver:
+    def __init__(self, row_definitions: [[int]], col_definitions: [[int]]):
+        self.row_defs = row_definitions
+        self.col_defs = col_definitions
+        self.height = len(row_definitions)
+        self.width = len(col_definitions)
+        self.grid = BitGrid(self.height, self.width)
+        self.empty = BitGrid(self.height, self.width)
+        self.trail = []
+        self.stats = {"nodes": 0, "max_depth": 0, "time": 0.0, "nodes_per_second": 0.0}
+
+    def get_row(self, row: int) -> [int]:
+        return self._line(self.grid.rows[row], self.empty.rows[row], self.width)
+
+    def get_col(self, col: int) -> [int]:
+        return self._line(self.grid.cols[col], self.empty.cols[col], self.height)
+
+    @staticmethod
+    def _line(filled: int, empty: int, n: int) -> [int]:
+        return [FILLED if filled >> i & 1 else EMPTY if empty >> i & 1 else UNKNOWN for i in range(n)]
+
+    def _is_unknown(self, row: int, col: int) -> bool:
+        return not (self.grid.get(row, col) or self.empty.get(row, col))
+
+    def _set(self, row: int, col: int, value: int):
+        if value == FILLED:
+            self.grid.set(row, col, 1)
+        else:
+            self.empty.set(row, col, 1)
+        self.trail.append((row, col))
+
+    def _undo(self, mark: int):
+        while len(self.trail) > mark:
+            row, col = self.trail.pop()
+            self.grid.set(row, col, 0)
+            self.empty.set(row, col, 0)
+
+    def _propagate(self, dirty) -> bool:
+        queue = deque(dirty)
+        queued = set(queue)
+        while queue:
+            line = queue.popleft()
+            queued.discard(line)
+            kind, index = line
+
+            if kind == "r":
+                current = self.get_row(index)
+                solved = solve_line(current, self.row_defs[index])
+            else:
+                current = self.get_col(index)
+                solved = solve_line(current, self.col_defs[index])
+
+            if solved is None:
+                return False
+
+            for i, value in enumerate(solved):
+                if value == current[i]:
+                    continue
+                if kind == "r":
+                    self._set(index, i, value)
+                    crossing = ("c", i)
+                else:
+                    self._set(i, index, value)
+                    crossing = ("r", i)
+                if crossing not in queued:
+                    queued.add(crossing)
+                    queue.append(crossing)
+        return True
+
+    # pola gwarantowane z calculate_guaranteed_cells, potem pełna propagacja
+    def _initial_propagation(self) -> bool:
+        # opis, który nie mieści się w linii - nie ma rozwiązania
+        if any(count_combinations(blocks, self.width) == 0 for blocks in self.row_defs) or \
+                any(count_combinations(blocks, self.height) == 0 for blocks in self.col_defs):
+            return False
+
+        for r in range(self.height):
+            guaranteed, _ = line_cache.get(self.row_defs[r], self.width)
+            for c in range(self.width):
+                if guaranteed[c] == 2 and self._is_unknown(r, c):
+                    self._set(r, c, FILLED)
+        for c in range(self.width):
+            guaranteed, _ = line_cache.get(self.col_defs[c], self.height)
+            for r in range(self.height):
+                if guaranteed[r] == 2 and self._is_unknown(r, c):
+                    self._set(r, c, FILLED)
+        return self._propagate([("r", r) for r in range(self.height)] + [("c", c) for c in range(self.width)])
+
+    # najbardziej ograniczone pole: najmniej nieznanych w jego wierszu i kolumnie razem
+    def _pick_cell(self):
+        full_row = (1 << self.width) - 1
+        col_unknown = [self.height - (self.grid.cols[c] | self.empty.cols[c]).bit_count() for c in range(self.width)]
+        best = None
+        best_unknown = float("inf")
+        for r in range(self.height):
+            unknown = full_row & ~(self.grid.rows[r] | self.empty.rows[r])
+            row_unknown = unknown.bit_count()
+            for c in mask_bits(unknown):
+                if row_unknown + col_unknown[c] < best_unknown:
+                    best_unknown = row_unknown + col_unknown[c]
+                    best = (r, c)
+        return best
+
+    def _decide(self, row: int, col: int, value: int) -> bool:
+        self.stats["nodes"] += 1
+        self._set(row, col, value)
+        return self._propagate([("r", row), ("c", col)])
+
+    def _finish(self, start_time: float, result: bool) -> bool:
+        self.stats["time"] = time() - start_time
+        self.stats["nodes_per_second"] = self.stats["nodes"] / max(self.stats["time"], 1e-9)
+        return result
+
+    def solve(self, timeout=None) -> bool:
+        start_time = time()
+        if not self._initial_propagation():
+            return self._finish(start_time, False)
+
+        # na stosie: (długość trail przed decyzją, wiersz, kolumna, sprawdzana wartość)
+        stack = []
+        while True:
+            if timeout is not None and time() - start_time > timeout:
+                return self._finish(start_time, False)
+
+            cell = self._pick_cell()
+            if cell is None:
+                return self._finish(start_time, True)
+
+            row, col = cell
+            stack.append((len(self.trail), row, col, FILLED))
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(stack))
+            ok = self._decide(row, col, FILLED)
+
+            # sprzeczność - wracamy do ostatniej decyzji, która ma jeszcze drugą wartość
+            while not ok:
+                if not stack:
+                    return self._finish(start_time, False)
+                mark, row, col, value = stack.pop()
+                self._undo(mark)
+                if value == FILLED:
+                    stack.append((mark, row, col, EMPTY))
+                    ok = self._decide(row, col, EMPTY)
+
+    def display(self) -> str:
+        return "\n".join("".join("#" if cell else "." for cell in row) for row in self.grid)
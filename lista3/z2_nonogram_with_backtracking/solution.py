@@ -1,19 +1,28 @@
-from solver import CommandoSolver
+import os
+import sys
+
+# backtracking importuje moduły od katalogu głównego repozytorium - dopisujemy go,
+# żeby skrypt dało się uruchomić także z tego katalogu
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from backtracking import BacktrackingSolver
 
 
 # Read input
 def read_and_parse(file: str):
-    with open("zad_input.txt", 'r') as file:
-        file = file.readlines()
+    with open(file, 'r') as f:
+        lines = [x.strip() for x in f.readlines()]
 
-    data = [x.strip() for x in file]
+    height, width = map(int, lines[0].split())
+    rows = [list(map(int, x.split())) for x in lines[1:1 + height]]
+    cols = [list(map(int, x.split())) for x in lines[1 + height:1 + height + width]]
 
-    return data
+    return rows, cols
 
-board = read_and_parse("zad_input1.txt")
+rows, cols = read_and_parse("zad_input.txt")
 
-solver = CommandoSolver(board)
+solver = BacktrackingSolver(rows, cols)
+solver.solve()
 
 with open("zad_output.txt", 'w') as file:
-    file.write(solver.solve())
-
+    file.write(solver.display() + "\n")
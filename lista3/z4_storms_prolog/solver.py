@@ -72,15 +72,17 @@ class CommandoSolver:
         # najdalszego w sensie długości trasy którą już pokonał + odległości do najbliższego celu z aktualnej pozycji
         # w sensie no ta długość pokonanej jest taka sama dla każdego komandosa w danym stanie XD
         initial_heuristic = max(self.goal_dist[r][c] for (r, c) in start)
-        heap = [(initial_heuristic, counter, start, [])]
-        heapq.heapify(heap)
+        # w kopcu tylko stan i długość ścieżki; entries[i] = (numer poprzedniego wpisu, ruch) dla wpisu
+        # o numerze i (counter), więc ścieżkę odtwarzamy raz, dla zdjętego stanu końcowego
+        heap = [(initial_heuristic, counter, start, 0)]
+        entries = [(None, None)]
 
         while heap:
-            priority, _, current, path = heapq.heappop(heap)
+            priority, entry, current, cost = heapq.heappop(heap)
 
             # warunek końca - wszyscy na mecie
             if all(self.goal_dist[r][c] == 0 for (r, c) in current):
-                return path
+                return self._rebuild_path(entries, entry)
 
             # "odwiedzone" stany komandosów
             if current in visited:
@@ -103,10 +105,20 @@ class CommandoSolver:
 
                 # wyliczanie priorytetu
                 h = max(self.goal_dist[r][c] for (r, c) in new_state)
-                new_cost = len(path) + 1
+                new_cost = cost + 1
                 new_priority = new_cost + h * 1.1
 
                 counter += 1
-                heapq.heappush(heap, (new_priority, counter, new_state, path + [dir_name]))
-
-        return []  # nie ma trasy
\ No newline at end of file
+                entries.append((entry, dir_name))
+                heapq.heappush(heap, (new_priority, counter, new_state, new_cost))
+
+        return []  # nie ma trasy
+
+    @staticmethod
+    def _rebuild_path(entries, entry: int) -> List[str]:
+        path = []
+        while entries[entry][0] is not None:
+            entry, dir_name = entries[entry]
+            path.append(dir_name)
+        path.reverse()
+        return path
@@ -0,0 +1,159 @@
+import argparse
+import csv
+import json
+import os
+import resource
+import sys
+from multiprocessing import get_context
+from time import time
+
+# porównanie solverów nonogramów na katalogu zagadek w formacie parse_file (lista1/z5_nonogram_walksat/utils.py),
+# z tą różnicą, że linia opisu może mieć kilka bloków; każdy solver działa w osobnym procesie z limitem czasu
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_puzzle(path: str):
+    with open(path) as f:
+        lines = [x.split() for x in f if x.strip()]
+    rows_count, cols_count = int(lines[0][0]), int(lines[0][1])
+    rows = [list(map(int, x)) for x in lines[1:1 + rows_count]]
+    cols = [list(map(int, x)) for x in lines[1 + rows_count:1 + rows_count + cols_count]]
+    return rows, cols
+
+
+class Unsupported(Exception):
+    pass
+
+
+# każdy runner najpierw importuje swój solver (błąd importu to osobny status), potem go uruchamia
+def run_walksat(rows, cols, timeout):
+    sys.path.insert(0, os.path.join(ROOT, "lista1", "z5_nonogram_walksat"))
+    from image import Image
+
+    # ten solver zna tylko jeden blok na linię
+    if any(len(x) > 1 for x in rows + cols):
+        raise Unsupported("more than one block in a line")
+    image = Image([x[0] for x in rows], [x[0] for x in cols], len(cols), len(rows))
+    solved = image.solve(max_iterations=float("inf"), timeout=timeout)
+    return solved, image.stats
+
+
+def run_local_search(rows, cols, timeout):
+    from lista2.z1_nonogram.nonogram import Nonogram
+
+    nonogram = Nonogram(rows, cols)
+    solved = nonogram.solve(timeout=timeout)
+    return solved, getattr(nonogram, "stats", {})
+
+
+def run_deduction(rows, cols, timeout):
+    from lista3.z1_nonogram_with_deduction.nonogram import Nonogram
+
+    nonogram = Nonogram(rows, cols)
+    solved = nonogram.solve(timeout=timeout)
+    return solved, getattr(nonogram, "stats", {})
+
+
+def run_backtracking(rows, cols, timeout):
+    from lista3.z2_nonogram_with_backtracking.backtracking import BacktrackingSolver
+
+    solver = BacktrackingSolver(rows, cols)
+    solved = solver.solve(timeout=timeout)
+    return solved, solver.stats
+
+
+SOLVERS = {
+    "walksat": run_walksat,
+    "local_search": run_local_search,
+    "deduction": run_deduction,
+    "backtracking": run_backtracking,
+}
+
+
+# status: solved / unsolved / unsupported / import_error / error / timeout;
+# solved jest None, jeśli solver w ogóle nie doszedł do wyniku
+def worker(solver_name, path, timeout, conn):
+    sys.path.insert(0, ROOT)
+    rows, cols = parse_puzzle(path)
+    start_time = time()
+    solved, stats, error = None, {}, None
+    try:
+        solved, stats = SOLVERS[solver_name](rows, cols, timeout)
+        status = "solved" if solved else "unsolved"
+    except ImportError as e:
+        status, error = "import_error", repr(e)
+    except Unsupported as e:
+        status, error = "unsupported", str(e)
+    except Exception as e:
+        status, error = "error", repr(e)
+    conn.send({
+        "status": status,
+        "solved": solved,
+        "wall_time": time() - start_time,
+        "iterations": stats.get("iterations", stats.get("nodes")),
+        "restarts": stats.get("restarts"),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "error": error,
+    })
+
+
+def run_one(solver_name, path, timeout):
+    context = get_context("spawn")  # świeży interpreter - solvery mają moduły o tych samych nazwach
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=worker, args=(solver_name, path, timeout, child_conn))
+    start_time = time()
+    process.start()
+
+    # zapas ponad limit na start interpretera i solvery, które sprawdzają czas rzadko
+    if parent_conn.poll(timeout * 1.5 + 5):
+        result = parent_conn.recv()
+        process.join()
+    else:
+        process.terminate()
+        process.join()
+        result = {"status": "timeout", "solved": None, "wall_time": time() - start_time, "iterations": None,
+                  "restarts": None, "peak_rss_kb": None, "error": "timeout"}
+
+    return {"puzzle": os.path.basename(path), "solver": solver_name, **result}
+
+
+def run_benchmark(puzzles_dir, solvers=tuple(SOLVERS), timeout=30):
+    results = []
+    for name in sorted(os.listdir(puzzles_dir)):
+        path = os.path.join(puzzles_dir, name)
+        if not os.path.isfile(path):
+            continue
+        for solver_name in solvers:
+            result = run_one(solver_name, path, timeout)
+            print(f"{result['puzzle']} {solver_name}: {result['status']} time={result['wall_time']:.2f}s")
+            if result["status"] in ("import_error", "error"):
+                print(f"  {result['error']}", file=sys.stderr)
+            results.append(result)
+    return results
+
+
+def save_results(results, output):
+    if output.endswith(".json"):
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        return
+
+    with open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]) if results else ["puzzle", "solver"])
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("puzzles", help="Directory with puzzles in parse_file format")
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS.keys(), default=list(SOLVERS), help="Solvers to run")
+    parser.add_argument("--timeout", type=float, default=30, help="Time limit per puzzle and solver in seconds")
+    parser.add_argument("--output", default="benchmark_results.csv", help="Output file (.csv or .json)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    save_results(run_benchmark(args.puzzles, args.solvers, args.timeout), args.output)